@@ -1,49 +1,117 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, File, UploadFile, status
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, File, Form, Query, UploadFile, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import AsyncMongoClient
 import os
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, ConfigDict, Field, EmailStr
 from typing import List, Optional
 import uuid
 from datetime import datetime, timezone, timedelta
 import bcrypt
-import jwt
+import hashlib
 import base64
 import asyncio
-from pymongo import DESCENDING
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from bson import ObjectId
+from cachetools import TTLCache
+import orjson
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from gridfs import AsyncGridFSBucket
+from pymongo import DESCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
+# MongoDB connection. Explicit pool bounds keep tail latency predictable
+# under concurrent load: enough sockets that hot endpoints don't queue,
+# capped so a traffic spike can't exhaust the server, and short timeouts
+# so a dead server fails fast instead of hanging requests.
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncMongoClient(
+    mongo_url,
+    maxPoolSize=int(os.environ.get('MONGO_POOL', '50')),
+    minPoolSize=5,
+    serverSelectionTimeoutMS=3000,
+    waitQueueTimeoutMS=2000,
+    retryWrites=True
+)
 db = client[os.environ['DB_NAME']]
 
+# Image bytes live in GridFS, not inside the image documents. Keeping blobs
+# out of the BSON docs keeps list queries small and sidesteps the 16 MB
+# document cap; clients fetch the bytes from the streaming blob endpoint.
+fs_bucket = AsyncGridFSBucket(db)
+
 # JWT Configuration
-JWT_SECRET = os.environ.get('JWT_SECRET', 'your-secret-key-change-in-production')
-JWT_ALGORITHM = "HS256"
+# Ed25519 (EdDSA) signatures, with both keys loaded once at import. Set
+# JWT_PRIVATE_KEY to a PEM-encoded Ed25519 key so tokens survive restarts
+# and replicas share a key. Without it, the key is derived from JWT_SECRET
+# so every worker process signs and verifies with the same pair. Only when
+# neither is set does each process generate its own ephemeral key — fine
+# for single-worker development, broken under multiple workers, hence the
+# warning.
+JWT_ALGORITHM = "EdDSA"
 JWT_EXPIRATION_HOURS = 24
 
+_jwt_private_pem = os.environ.get('JWT_PRIVATE_KEY')
+_jwt_secret = os.environ.get('JWT_SECRET')
+if _jwt_private_pem:
+    JWT_PRIVATE_KEY = serialization.load_pem_private_key(_jwt_private_pem.encode('utf-8'), password=None)
+elif _jwt_secret:
+    JWT_PRIVATE_KEY = ed25519.Ed25519PrivateKey.from_private_bytes(
+        hashlib.sha256(_jwt_secret.encode('utf-8')).digest()
+    )
+else:
+    logging.warning(
+        "Neither JWT_PRIVATE_KEY nor JWT_SECRET is set; using an ephemeral "
+        "per-process signing key. Tokens will not survive restarts and will "
+        "NOT validate across multiple worker processes."
+    )
+    JWT_PRIVATE_KEY = ed25519.Ed25519PrivateKey.generate()
+JWT_PUBLIC_KEY = JWT_PRIVATE_KEY.public_key()
+
 # Security
 security = HTTPBearer()
 
-# Create the main app without a prefix
-app = FastAPI(title="GiaStylez API", version="1.0.0")
+# Verified-token cache: amortizes the HMAC check across repeat requests with
+# the same bearer token. Keyed by sha256(token) so raw tokens never sit in
+# memory. The short TTL bounds how long a token keeps working after its user
+# record changes (there is no token revocation list to consult).
+JWT_CACHE_TTL_SECONDS = 30
+_jwt_cache = TTLCache(maxsize=10_000, ttl=JWT_CACHE_TTL_SECONDS)
+
+# Resolved-user cache: skips the users.find_one that every authenticated
+# request otherwise pays just to check is_banned/is_admin. Entries are
+# evicted explicitly on ban/unban; the short TTL bounds staleness for any
+# other out-of-band change to a user document.
+USER_CACHE_TTL_SECONDS = 60
+_user_cache = TTLCache(maxsize=5000, ttl=USER_CACHE_TTL_SECONDS)
+
+# Create the main app without a prefix. orjson handles response encoding;
+# with uvloop/httptools installed, uvicorn picks them up automatically.
+app = FastAPI(title="GiaStylez API", version="1.0.0", default_response_class=ORJSONResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
+# Single timestamp helper shared by every default_factory and handler;
+# avoids rebuilding the lambda/attribute chain at each model instantiation
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
 # Models
 class User(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     email: EmailStr
     password: str
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=_utcnow)
     is_admin: bool = False
     is_banned: bool = False
 
@@ -55,7 +123,12 @@ class UserLogin(BaseModel):
     email: EmailStr
     password: str
 
+# Response models carry trusted data from our own collections; they are
+# built with model_construct (no re-validation) and explicitly drop any
+# stray document fields. Input models keep full validation.
 class UserResponse(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+
     id: str
     email: str
     created_at: datetime
@@ -64,22 +137,20 @@ class UserResponse(BaseModel):
 class Image(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     title: str
-    image_data: str  # base64 encoded
+    blob_id: str  # GridFS file id holding the raw image bytes
+    content_type: str = "application/octet-stream"
     user_id: str
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=_utcnow)
     expose_me: bool = False
     votes: int = 0
     likes: int = 0
 
-class ImageCreate(BaseModel):
-    title: str
-    image_data: str
-    expose_me: bool = False
-
 class ImageResponse(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+
     id: str
     title: str
-    image_data: str
+    blob_url: str
     user_id: str
     created_at: datetime
     expose_me: bool
@@ -92,12 +163,14 @@ class Comment(BaseModel):
     image_id: str
     user_id: str
     content: str
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=_utcnow)
 
 class CommentCreate(BaseModel):
     content: str
 
 class CommentResponse(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+
     id: str
     image_id: str
     user_id: str
@@ -110,7 +183,7 @@ class Vote(BaseModel):
     image_id: str
     user_id: str
     vote_type: str  # "up" or "down"
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=_utcnow)
 
 class VoteCreate(BaseModel):
     vote_type: str
@@ -119,34 +192,103 @@ class Like(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     image_id: str
     user_id: str
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=_utcnow)
 
 # Utility functions
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', '12'))
+
+# bcrypt takes ~250ms at the default cost factor; run it in a worker thread
+# so it never blocks the event loop for other requests.
+async def hash_password(password: str) -> str:
+    return await asyncio.to_thread(
+        lambda: bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(BCRYPT_ROUNDS)).decode('utf-8')
+    )
+
+async def verify_password(password: str, hashed: str) -> bool:
+    return await asyncio.to_thread(
+        lambda: bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    )
 
-def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+def _b64url_encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+def _b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + '=' * (-len(segment) % 4))
+
+# Constant pieces of token issuing, computed once at import: the expiry
+# delta and the encoded JOSE header (the header never varies per token)
+_JWT_EXP_DELTA = timedelta(hours=JWT_EXPIRATION_HOURS)
+_JWT_HEADER_B64 = _b64url_encode(orjson.dumps({"alg": JWT_ALGORITHM, "typ": "JWT"}))
 
 def create_jwt_token(user_id: str) -> str:
-    payload = {
+    payload = orjson.dumps({
         "user_id": user_id,
-        "exp": datetime.now(timezone.utc) + timedelta(hours=JWT_EXPIRATION_HOURS)
-    }
-    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+        "exp": int((_utcnow() + _JWT_EXP_DELTA).timestamp())
+    })
+    signing_input = f"{_JWT_HEADER_B64}.{_b64url_encode(payload)}"
+    signature = JWT_PRIVATE_KEY.sign(signing_input.encode('ascii'))
+    return f"{signing_input}.{_b64url_encode(signature)}"
+
+def _verify_and_parse(token: str) -> dict:
+    # One-shot verifier: check the Ed25519 signature over the signing input
+    # and parse the payload JSON exactly once. The header is never parsed —
+    # the algorithm is fixed server-side, so its contents carry no authority.
+    signing_input, _, sig_b64 = token.rpartition('.')
+    header_b64, _, payload_b64 = signing_input.partition('.')
+    if not header_b64 or not payload_b64:
+        raise ValueError("Malformed token")
+    JWT_PUBLIC_KEY.verify(_b64url_decode(sig_b64), signing_input.encode('ascii'))
+    return orjson.loads(_b64url_decode(payload_b64))
 
 def verify_jwt_token(token: str) -> str:
-    try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        return payload["user_id"]
-    except jwt.ExpiredSignatureError:
+    token_hash = hashlib.sha256(token.encode('utf-8')).digest()
+    payload = _jwt_cache.get(token_hash)
+    if payload is None:
+        try:
+            payload = _verify_and_parse(token)
+        except (ValueError, TypeError, KeyError, InvalidSignature):
+            raise HTTPException(status_code=401, detail="Invalid token")
+        if not isinstance(payload.get("exp"), (int, float)) or "user_id" not in payload:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        # Only successfully verified payloads are cached; invalid tokens
+        # always pay full verification cost.
+        _jwt_cache[token_hash] = payload
+    # exp is re-checked on every call so neither a fresh verify nor a cache
+    # hit can serve an expired token.
+    if payload["exp"] <= _utcnow().timestamp():
+        _jwt_cache.pop(token_hash, None)
         raise HTTPException(status_code=401, detail="Token expired")
-    except jwt.InvalidTokenError:
-        raise HTTPException(status_code=401, detail="Invalid token")
+    return payload["user_id"]
+
+async def _load_user(user_id: str):
+    user = _user_cache.get(user_id)
+    if user is None:
+        user = await db.users.find_one({"id": user_id})
+        if user is not None:
+            _user_cache[user_id] = user
+    return user
+
+async def _resolve_user_emails(user_ids):
+    # Map user_id -> email for a page of rows: known users come from
+    # _user_cache, the misses are fetched with a single $in query (and
+    # cached for the next page)
+    emails = {}
+    misses = []
+    for user_id in set(user_ids):
+        user = _user_cache.get(user_id)
+        if user is not None:
+            emails[user_id] = user["email"]
+        else:
+            misses.append(user_id)
+    if misses:
+        async for user in db.users.find({"id": {"$in": misses}}):
+            _user_cache[user["id"]] = user
+            emails[user["id"]] = user["email"]
+    return emails
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     user_id = verify_jwt_token(credentials.credentials)
-    user = await db.users.find_one({"id": user_id})
+    user = await _load_user(user_id)
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
     if user.get("is_banned", False):
@@ -158,31 +300,64 @@ async def get_admin_user(current_user: User = Depends(get_current_user)):
         raise HTTPException(status_code=403, detail="Admin access required")
     return current_user
 
-# Auto-cleanup job for 2-day old images
-async def cleanup_old_images():
-    while True:
+async def ensure_indexes():
+    # Cover every hot query predicate so lookups stay index-backed as data
+    # grows. Each build is guarded individually: a unique index can
+    # legitimately fail against pre-existing duplicate data, and one such
+    # failure must not skip the rest — get_images hints the compound feed
+    # index and would 500 on every request if it silently went missing.
+    index_specs = [
+        (db.users, "id", {"unique": True}),
+        (db.users, "email", {"unique": True}),
+        (db.images, "id", {"unique": True}),
+        (db.images, "user_id", {}),
+        (db.images, "created_at", {}),
+        # Backs the compound sort (and hint) in get_images
+        (db.images, [
+            ("expose_me", DESCENDING),
+            ("votes", DESCENDING),
+            ("created_at", DESCENDING)
+        ], {}),
+        (db.votes, "id", {"unique": True}),
+        (db.votes, [("image_id", 1), ("user_id", 1)], {"unique": True}),
+        (db.likes, "id", {"unique": True}),
+        (db.likes, [("image_id", 1), ("user_id", 1)], {"unique": True}),
+        (db.comments, "id", {"unique": True}),
+        (db.comments, "image_id", {})
+    ]
+    for collection, keys, kwargs in index_specs:
         try:
-            two_days_ago = datetime.now(timezone.utc) - timedelta(days=2)
-            
-            # Find images older than 2 days
-            old_images = await db.images.find({"created_at": {"$lt": two_days_ago}}).to_list(1000)
-            
-            for image in old_images:
-                # Delete associated comments and votes
-                await db.comments.delete_many({"image_id": image["id"]})
-                await db.votes.delete_many({"image_id": image["id"]})
-                await db.likes.delete_many({"image_id": image["id"]})
-                
-                # Delete the image
-                await db.images.delete_one({"id": image["id"]})
-                
-                logging.info(f"Deleted old image: {image['id']}")
-            
-            # Sleep for 1 hour before next cleanup
-            await asyncio.sleep(3600)
+            await collection.create_index(keys, **kwargs)
         except Exception as e:
-            logging.error(f"Error in cleanup job: {e}")
-            await asyncio.sleep(3600)
+            logging.error(f"Error creating index {keys} on {collection.name}: {e}")
+
+# Auto-cleanup job for 2-day old images, run hourly by the scheduler
+async def cleanup_old_images():
+    try:
+        two_days_ago = _utcnow() - timedelta(days=2)
+
+        # Only ids and blob ids are needed for the cascade
+        old_images = await db.images.find(
+            {"created_at": {"$lt": two_days_ago}},
+            {"id": 1, "blob_id": 1, "_id": 0}
+        ).to_list(None)
+
+        if old_images:
+            # Four bulk deletes with $in instead of four round trips
+            # per image; blob deletions run concurrently alongside
+            ids = [image["id"] for image in old_images]
+            await asyncio.gather(
+                db.comments.delete_many({"image_id": {"$in": ids}}),
+                db.votes.delete_many({"image_id": {"$in": ids}}),
+                db.likes.delete_many({"image_id": {"$in": ids}}),
+                db.images.delete_many({"id": {"$in": ids}}),
+                *(_delete_blob(image.get("blob_id")) for image in old_images)
+            )
+            logging.info(f"Cleanup removed {len(ids)} old images")
+    except Exception as e:
+        logging.error(f"Error in cleanup job: {e}")
+
+scheduler = AsyncIOScheduler()
 
 # Authentication routes
 @api_router.post("/register", response_model=UserResponse)
@@ -193,7 +368,7 @@ async def register_user(user_data: UserCreate):
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Create user
-    hashed_password = hash_password(user_data.password)
+    hashed_password = await hash_password(user_data.password)
     user = User(email=user_data.email, password=hashed_password)
     
     # Make first user admin
@@ -207,7 +382,7 @@ async def register_user(user_data: UserCreate):
 @api_router.post("/login")
 async def login_user(user_data: UserLogin):
     user = await db.users.find_one({"email": user_data.email})
-    if not user or not verify_password(user_data.password, user["password"]):
+    if not user or not await verify_password(user_data.password, user["password"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     if user.get("is_banned", False):
@@ -225,63 +400,130 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
     return UserResponse(id=current_user.id, email=current_user.email, created_at=current_user.created_at, is_admin=current_user.is_admin)
 
 # Image routes
+def _blob_url(image_id: str) -> str:
+    return f"/api/images/{image_id}/blob"
+
+async def _delete_blob(blob_id: Optional[str]):
+    if not blob_id:
+        return
+    try:
+        await fs_bucket.delete(ObjectId(blob_id))
+    except Exception as e:
+        logging.warning(f"Failed to delete blob {blob_id}: {e}")
+
 @api_router.post("/images", response_model=ImageResponse)
-async def upload_image(image_data: ImageCreate, current_user: User = Depends(get_current_user)):
+async def upload_image(
+    title: str = Form(...),
+    expose_me: bool = Form(False),
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_user)
+):
     image = Image(
-        title=image_data.title,
-        image_data=image_data.image_data,
+        title=title,
+        blob_id="",
+        content_type=file.content_type or "application/octet-stream",
         user_id=current_user.id,
-        expose_me=image_data.expose_me
+        expose_me=expose_me
     )
+    # Stream the multipart body into GridFS in 64 KiB chunks; the payload
+    # is never fully buffered, so memory stays flat however large the file.
+    # open_upload_stream is a plain method in PyMongo's async GridFS (the
+    # writes themselves are the awaitables). The abort drops any partially
+    # written chunks; the original error propagates so server-side failures
+    # surface as 500s, not client errors.
+    grid_in = fs_bucket.open_upload_stream(image.id)
+    try:
+        while chunk := await file.read(1 << 16):
+            await grid_in.write(chunk)
+        await grid_in.close()
+    except Exception:
+        await grid_in.abort()
+        raise
+    image.blob_id = str(grid_in._id)
     await db.images.insert_one(image.dict())
-    
-    # Return with user email
-    user = await db.users.find_one({"id": current_user.id})
-    return ImageResponse(**image.dict(), user_email=user["email"])
+
+    return ImageResponse.model_construct(**image.dict(), blob_url=_blob_url(image.id), user_email=current_user.email)
 
 @api_router.get("/images", response_model=List[ImageResponse])
-async def get_images(skip: int = 0, limit: int = 20):
-    # Sort by expose_me first (priority), then by votes, then by created_at
-    images = await db.images.find().sort([
-        ("expose_me", DESCENDING),
-        ("votes", DESCENDING),
-        ("created_at", DESCENDING)
-    ]).skip(skip).limit(limit).to_list(limit)
-    
-    # Add user email to each image
-    result = []
-    for image in images:
-        user = await db.users.find_one({"id": image["user_id"]})
-        image_response = ImageResponse(**image, user_email=user["email"] if user else None)
-        result.append(image_response)
-    
-    return result
+async def get_images(skip: int = Query(0, ge=0), limit: int = Query(20, ge=1, le=100)):
+    # Sort by expose_me first (priority), then by votes, then by created_at.
+    # A single aggregation with $lookup attaches user_email server-side,
+    # avoiding one users.find_one round trip per image (N+1).
+    cursor = await db.images.aggregate([
+        {"$sort": {"expose_me": DESCENDING, "votes": DESCENDING, "created_at": DESCENDING}},
+        {"$skip": skip},
+        {"$limit": limit},
+        {"$lookup": {"from": "users", "localField": "user_id", "foreignField": "id", "as": "_user"}},
+        {"$addFields": {"user_email": {"$arrayElemAt": ["$_user.email", 0]}}},
+        # image_data is excluded for documents that predate GridFS storage,
+        # so a page of metadata never drags multi-MB payloads off the server
+        {"$project": {"_user": 0, "_id": 0, "image_data": 0}}
+    ], hint={
+        # Pin the $sort to the compound feed index; skips planner work and
+        # guards against plan-cache flapping. Must be a document (or index
+        # name) — aggregate forwards the hint verbatim, with none of the
+        # list-of-tuples conversion find().hint() applies.
+        "expose_me": DESCENDING,
+        "votes": DESCENDING,
+        "created_at": DESCENDING
+    })
+    images = await cursor.to_list(limit)
+
+    # model_construct skips re-validation; these rows come straight from our
+    # own collections and are already typed
+    return [ImageResponse.model_construct(**image, blob_url=_blob_url(image["id"])) for image in images]
 
 @api_router.get("/images/{image_id}", response_model=ImageResponse)
 async def get_image(image_id: str):
-    image = await db.images.find_one({"id": image_id})
+    image = await db.images.find_one({"id": image_id}, {"image_data": 0})
     if not image:
         raise HTTPException(status_code=404, detail="Image not found")
     
     user = await db.users.find_one({"id": image["user_id"]})
-    return ImageResponse(**image, user_email=user["email"] if user else None)
+    return ImageResponse.model_construct(**image, blob_url=_blob_url(image["id"]), user_email=user["email"] if user else None)
+
+@api_router.get("/images/{image_id}/blob")
+async def get_image_blob(image_id: str):
+    image = await db.images.find_one({"id": image_id}, {"blob_id": 1, "content_type": 1})
+    if not image or not image.get("blob_id"):
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    try:
+        stream = await fs_bucket.open_download_stream(ObjectId(image["blob_id"]))
+    except Exception:
+        raise HTTPException(status_code=404, detail="Image data not found")
+
+    async def iter_blob():
+        while True:
+            chunk = await stream.readchunk()
+            if not chunk:
+                break
+            yield chunk
+
+    return StreamingResponse(iter_blob(), media_type=image.get("content_type", "application/octet-stream"))
 
 @api_router.delete("/images/{image_id}")
 async def delete_image(image_id: str, current_user: User = Depends(get_current_user)):
-    image = await db.images.find_one({"id": image_id})
-    if not image:
+    # Only owner or admin can delete; the ownership predicate rides the
+    # delete filter so the check-and-remove is one atomic round trip
+    query = {"id": image_id}
+    if not current_user.is_admin:
+        query["user_id"] = current_user.id
+    image = await db.images.find_one_and_delete(query, {"blob_id": 1})
+    if image is None:
+        # Failure path only: one extra read to tell 403 from 404
+        if await db.images.count_documents({"id": image_id}, limit=1):
+            raise HTTPException(status_code=403, detail="Not authorized to delete this image")
         raise HTTPException(status_code=404, detail="Image not found")
-    
-    # Only owner or admin can delete
-    if image["user_id"] != current_user.id and not current_user.is_admin:
-        raise HTTPException(status_code=403, detail="Not authorized to delete this image")
-    
-    # Delete associated data
-    await db.comments.delete_many({"image_id": image_id})
-    await db.votes.delete_many({"image_id": image_id})
-    await db.likes.delete_many({"image_id": image_id})
-    await db.images.delete_one({"id": image_id})
-    
+
+    # Delete associated data concurrently
+    await asyncio.gather(
+        db.comments.delete_many({"image_id": image_id}),
+        db.votes.delete_many({"image_id": image_id}),
+        db.likes.delete_many({"image_id": image_id}),
+        _delete_blob(image.get("blob_id"))
+    )
+
     return {"message": "Image deleted successfully"}
 
 # Voting routes
@@ -290,59 +532,89 @@ async def vote_image(image_id: str, vote_data: VoteCreate, current_user: User =
     if vote_data.vote_type not in ["up", "down"]:
         raise HTTPException(status_code=400, detail="Invalid vote type")
     
-    image = await db.images.find_one({"id": image_id})
-    if not image:
-        raise HTTPException(status_code=404, detail="Image not found")
-    
-    # Check if user already voted
-    existing_vote = await db.votes.find_one({"image_id": image_id, "user_id": current_user.id})
-    
-    if existing_vote:
-        if existing_vote["vote_type"] == vote_data.vote_type:
-            # Remove vote if same type
-            await db.votes.delete_one({"id": existing_vote["id"]})
-            vote_change = -1 if vote_data.vote_type == "up" else 1
-        else:
-            # Change vote type
-            await db.votes.update_one(
-                {"id": existing_vote["id"]},
-                {"$set": {"vote_type": vote_data.vote_type}}
-            )
-            vote_change = 2 if vote_data.vote_type == "up" else -2
-    else:
+    # Single atomic upsert on the unique {image_id, user_id} index. The
+    # pipeline update captures the previous vote_type, so the delta can be
+    # computed without a separate read and concurrent clicks cannot race.
+    async def _upsert_vote():
+        return await db.votes.find_one_and_update(
+            {"image_id": image_id, "user_id": current_user.id},
+            [{"$set": {
+                "id": {"$ifNull": ["$id", str(uuid.uuid4())]},
+                "image_id": image_id,
+                "user_id": current_user.id,
+                "prev_vote_type": "$vote_type",
+                "vote_type": vote_data.vote_type,
+                "created_at": {"$ifNull": ["$created_at", _utcnow()]}
+            }}],
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+
+    try:
+        vote = await _upsert_vote()
+    except DuplicateKeyError:
+        # Two concurrent upserts both missed and raced to insert; the
+        # retry finds the winner's document and updates it
+        vote = await _upsert_vote()
+
+    prev_vote_type = vote.get("prev_vote_type")
+    if prev_vote_type == vote_data.vote_type:
+        # Same vote again removes it
+        await db.votes.delete_one({"_id": vote["_id"]})
+        vote_change = -1 if vote_data.vote_type == "up" else 1
+    elif prev_vote_type is None:
         # New vote
-        vote = Vote(image_id=image_id, user_id=current_user.id, vote_type=vote_data.vote_type)
-        await db.votes.insert_one(vote.dict())
         vote_change = 1 if vote_data.vote_type == "up" else -1
-    
-    # Update image vote count
-    await db.images.update_one(
+    else:
+        # Changed vote type
+        vote_change = 2 if vote_data.vote_type == "up" else -2
+
+    # Update image vote count; matched_count doubles as the existence check
+    result = await db.images.update_one(
         {"id": image_id},
         {"$inc": {"votes": vote_change}}
     )
-    
+    if result.matched_count == 0:
+        await db.votes.delete_many({"image_id": image_id, "user_id": current_user.id})
+        raise HTTPException(status_code=404, detail="Image not found")
+
     return {"message": "Vote updated successfully"}
 
 # Like routes
 @api_router.post("/images/{image_id}/like")
 async def like_image(image_id: str, current_user: User = Depends(get_current_user)):
-    image = await db.images.find_one({"id": image_id})
-    if not image:
-        raise HTTPException(status_code=404, detail="Image not found")
-    
-    # Check if user already liked
-    existing_like = await db.likes.find_one({"image_id": image_id, "user_id": current_user.id})
-    
+    # Atomic toggle: one upsert on the unique {image_id, user_id} index.
+    # BEFORE=None means the like was just created; a document means this
+    # click is an unlike. The $inc's matched_count is the existence check.
+    like = Like(image_id=image_id, user_id=current_user.id)
+
+    async def _upsert_like():
+        return await db.likes.find_one_and_update(
+            {"image_id": image_id, "user_id": current_user.id},
+            {"$setOnInsert": like.dict()},
+            upsert=True,
+            return_document=ReturnDocument.BEFORE
+        )
+
+    try:
+        existing_like = await _upsert_like()
+    except DuplicateKeyError:
+        # Concurrent upserts raced to insert; retry sees the winner
+        existing_like = await _upsert_like()
+
     if existing_like:
         # Unlike
-        await db.likes.delete_one({"id": existing_like["id"]})
-        await db.images.update_one({"id": image_id}, {"$inc": {"likes": -1}})
+        await db.likes.delete_one({"_id": existing_like["_id"]})
+        result = await db.images.update_one({"id": image_id}, {"$inc": {"likes": -1}})
+        if result.matched_count == 0:
+            raise HTTPException(status_code=404, detail="Image not found")
         return {"message": "Image unliked"}
     else:
         # Like
-        like = Like(image_id=image_id, user_id=current_user.id)
-        await db.likes.insert_one(like.dict())
-        await db.images.update_one({"id": image_id}, {"$inc": {"likes": 1}})
+        result = await db.images.update_one({"id": image_id}, {"$inc": {"likes": 1}})
+        if result.matched_count == 0:
+            await db.likes.delete_one({"id": like.id})
+            raise HTTPException(status_code=404, detail="Image not found")
         return {"message": "Image liked"}
 
 # Comment routes
@@ -363,41 +635,48 @@ async def create_comment(image_id: str, comment_data: CommentCreate, current_use
 
 @api_router.get("/images/{image_id}/comments", response_model=List[CommentResponse])
 async def get_comments(image_id: str):
-    comments = await db.comments.find({"image_id": image_id}).sort("created_at", 1).to_list(1000)
-    
-    # Add user email to each comment
-    result = []
-    for comment in comments:
-        user = await db.users.find_one({"id": comment["user_id"]})
-        comment_response = CommentResponse(**comment, user_email=user["email"] if user else None)
-        result.append(comment_response)
-    
-    return result
+    comments = await db.comments.find({"image_id": image_id}, {"_id": 0}).sort("created_at", 1).to_list(1000)
+
+    # One $in query for the commenters this page hasn't cached yet; a
+    # thread of repeat commenters resolves without touching Mongo at all
+    emails = await _resolve_user_emails(comment["user_id"] for comment in comments)
+
+    # Trusted DB rows: construct without re-validation
+    return [
+        CommentResponse.model_construct(**comment, user_email=emails.get(comment["user_id"]))
+        for comment in comments
+    ]
 
 @api_router.delete("/comments/{comment_id}")
 async def delete_comment(comment_id: str, current_user: User = Depends(get_current_user)):
-    comment = await db.comments.find_one({"id": comment_id})
-    if not comment:
+    # Only owner or admin can delete; same atomic filter-and-delete shape
+    # as delete_image
+    query = {"id": comment_id}
+    if not current_user.is_admin:
+        query["user_id"] = current_user.id
+    comment = await db.comments.find_one_and_delete(query, {"id": 1})
+    if comment is None:
+        if await db.comments.count_documents({"id": comment_id}, limit=1):
+            raise HTTPException(status_code=403, detail="Not authorized to delete this comment")
         raise HTTPException(status_code=404, detail="Comment not found")
-    
-    # Only owner or admin can delete
-    if comment["user_id"] != current_user.id and not current_user.is_admin:
-        raise HTTPException(status_code=403, detail="Not authorized to delete this comment")
-    
-    await db.comments.delete_one({"id": comment_id})
+
     return {"message": "Comment deleted successfully"}
 
 # Admin routes
 @api_router.get("/admin/users", response_model=List[UserResponse])
 async def get_all_users(admin_user: User = Depends(get_admin_user)):
     users = await db.users.find().to_list(1000)
-    return [UserResponse(id=user["id"], email=user["email"], created_at=user["created_at"], is_admin=user.get("is_admin", False)) for user in users]
+    return [
+        UserResponse.model_construct(id=user["id"], email=user["email"], created_at=user["created_at"], is_admin=user.get("is_admin", False))
+        for user in users
+    ]
 
 @api_router.post("/admin/users/{user_id}/ban")
 async def ban_user(user_id: str, admin_user: User = Depends(get_admin_user)):
     result = await db.users.update_one({"id": user_id}, {"$set": {"is_banned": True}})
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
+    _user_cache.pop(user_id, None)
     return {"message": "User banned successfully"}
 
 @api_router.post("/admin/users/{user_id}/unban")
@@ -405,16 +684,20 @@ async def unban_user(user_id: str, admin_user: User = Depends(get_admin_user)):
     result = await db.users.update_one({"id": user_id}, {"$set": {"is_banned": False}})
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
+    _user_cache.pop(user_id, None)
     return {"message": "User unbanned successfully"}
 
 @api_router.get("/admin/stats")
 async def get_admin_stats(admin_user: User = Depends(get_admin_user)):
-    users_count = await db.users.count_documents({})
-    images_count = await db.images.count_documents({})
-    comments_count = await db.comments.count_documents({})
-    votes_count = await db.votes.count_documents({})
-    likes_count = await db.likes.count_documents({})
-    
+    # Independent counts, so run them concurrently
+    users_count, images_count, comments_count, votes_count, likes_count = await asyncio.gather(
+        db.users.count_documents({}),
+        db.images.count_documents({}),
+        db.comments.count_documents({}),
+        db.votes.count_documents({}),
+        db.likes.count_documents({})
+    )
+
     return {
         "users": users_count,
         "images": images_count,
@@ -448,9 +731,16 @@ logger = logging.getLogger(__name__)
 
 @app.on_event("startup")
 async def startup_event():
-    # Start cleanup job in background
-    asyncio.create_task(cleanup_old_images())
+    await ensure_indexes()
+    # Hourly cleanup; coalesce/max_instances keep overlapping or missed
+    # runs from piling up
+    scheduler.add_job(
+        cleanup_old_images, "interval", hours=1,
+        max_instances=1, coalesce=True, misfire_grace_time=300
+    )
+    scheduler.start()
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    scheduler.shutdown(wait=False)
+    await client.aclose()
\ No newline at end of file
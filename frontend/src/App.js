@@ -245,7 +245,7 @@ const Home = () => {
               
               <div className="relative">
                 <img
-                  src={`data:image/jpeg;base64,${image.image_data}`}
+                  src={`${BACKEND_URL}${image.blob_url}`}
                   alt={image.title}
                   className="w-full max-h-96 object-contain bg-gray-100"
                   onContextMenu={(e) => e.preventDefault()} // Disable right-click
@@ -521,20 +521,22 @@ const Register = () => {
 const Upload = () => {
   const { user } = useAuth();
   const [title, setTitle] = useState('');
-  const [image, setImage] = useState(null);
+  const [file, setFile] = useState(null);
+  const [preview, setPreview] = useState('');
   const [exposeMe, setExposeMe] = useState(false);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState('');
   const [success, setSuccess] = useState('');
 
   const handleImageChange = (e) => {
-    const file = e.target.files[0];
-    if (file) {
+    const selected = e.target.files[0];
+    if (selected) {
+      setFile(selected);
       const reader = new FileReader();
       reader.onload = (e) => {
-        setImage(e.target.result.split(',')[1]); // Remove data:image/jpeg;base64, prefix
+        setPreview(e.target.result);
       };
-      reader.readAsDataURL(file);
+      reader.readAsDataURL(selected);
     }
   };
 
@@ -548,7 +550,7 @@ const Upload = () => {
       return;
     }
 
-    if (!image) {
+    if (!file) {
       setError('Please select an image');
       return;
     }
@@ -556,15 +558,16 @@ const Upload = () => {
     setLoading(true);
 
     try {
-      await axios.post(`${API}/images`, {
-        title: title.trim(),
-        image_data: image,
-        expose_me: exposeMe
-      });
-      
+      const formData = new FormData();
+      formData.append('title', title.trim());
+      formData.append('expose_me', exposeMe);
+      formData.append('file', file);
+      await axios.post(`${API}/images`, formData);
+
       setSuccess('Image uploaded successfully!');
       setTitle('');
-      setImage(null);
+      setFile(null);
+      setPreview('');
       setExposeMe(false);
       document.getElementById('image-input').value = '';
       
@@ -611,10 +614,10 @@ const Upload = () => {
                 className="w-full p-3 border rounded-lg focus:ring-2 focus:ring-purple-600 focus:border-transparent"
                 required
               />
-              {image && (
+              {preview && (
                 <div className="mt-4">
                   <img
-                    src={`data:image/jpeg;base64,${image}`}
+                    src={preview}
                     alt="Preview"
                     className="max-w-full h-64 object-contain mx-auto border rounded"
                   />